@@ -3,14 +3,19 @@ from aws_cdk import (
     Tags,
     CfnOutput,
     Duration,
+    SecretValue,
     aws_ec2 as ec2,
     aws_elasticloadbalancingv2 as elbv2,
     aws_elasticloadbalancingv2_targets as targets,
+    aws_fsx as fsx,
     aws_iam as iam,
+    aws_rds as rds,
+    aws_s3 as s3,
     aws_ssm as ssm,
 )
 from constructs import Construct
 from . import config
+import json
 from network_infra import config as network_config
 
 class ComputeStack(Stack):
@@ -24,6 +29,7 @@ class ComputeStack(Stack):
         vpcs = {}
         alb_target_groups = {}
         alb_security_groups = {}
+        ec2_instances = {}
         
         for i, vpc_config in enumerate(network_config.VPC_LIST):
             vpc_id = ssm.StringParameter.value_from_lookup(self, f"/{vpc_config.VPC_NAME}/id")
@@ -47,27 +53,46 @@ class ComputeStack(Stack):
                 )
                 private_subnet_ids.append(subnet_id)
 
-            # Store VPC data for later reference by ALB and EC2 resources
+            # Get isolated subnets for this VPC, one per AZ for each isolated subnet spec
+            isolated_subnet_ids = []
+            isolated_subnet_count = sum(
+                len(subnet_spec.names) for subnet_spec in vpc_config.SUBNETS
+                if subnet_spec.subnet_type == 'isolated'
+            ) * vpc_config.VPC_MAX_AZS
+            for j in range(1, isolated_subnet_count + 1):
+                subnet_id = ssm.StringParameter.value_from_lookup(
+                    self, 
+                    f"/{vpc_config.VPC_NAME}/isolated-subnet-{j}/id"
+                )
+                isolated_subnet_ids.append(subnet_id)
+
+            # Store VPC data for later reference by ALB, EC2 and database resources
             vpcs[vpc_config.VPC_NAME] = {
                 'vpc': vpc,
                 'public_subnet_ids': public_subnet_ids,
-                'private_subnet_ids': private_subnet_ids
+                'private_subnet_ids': private_subnet_ids,
+                'isolated_subnet_ids': isolated_subnet_ids
             }
 
         # Create Application Load Balancers from configuration
         for compute_config in config.ALB_LIST:
             vpc_data = vpcs[compute_config.ALB_VPC]
-            alb, target_group, alb_sg= self.create_alb(
+            alb, target_groups, alb_sg= self.create_alb(
                 compute_config.ALB_NAME,
                 vpc_data['vpc'],
                 vpc_data['public_subnet_ids'],
                 compute_config.ALB_VPC,
                 compute_config.ALB_SG_ID,
                 compute_config.CERTIFICATE_ARN,
-                compute_config.SG_DESC
+                compute_config.SG_DESC,
+                compute_config.ACCESS_LOGS,
+                compute_config.ACCESS_LOG_PREFIX,
+                compute_config.ACCESS_LOG_RETENTION_DAYS,
+                compute_config.TARGET_GROUPS,
+                compute_config.LISTENER_RULES
             )
             # Store ALB resources for EC2 instance association
-            alb_target_groups[compute_config.ALB_NAME] = target_group
+            alb_target_groups[compute_config.ALB_NAME] = target_groups
             alb_security_groups[compute_config.ALB_NAME] = alb_sg
 
         # Create EC2 instances from configuration
@@ -86,7 +111,31 @@ class ComputeStack(Stack):
                 compute_config.EC2_ALB,
                 alb_target_groups,
                 alb_security_groups,
-                compute_config.EC2_SG_ID
+                compute_config.EC2_SG_ID,
+                compute_config.EC2_METRICS_PROFILE
+            )
+            # Store instances for database client access
+            ec2_instances[compute_config.EC2_NAME] = instance
+
+        # Create Aurora clusters with RDS Proxy from configuration
+        for db_config in config.DB_LIST:
+            vpc_data = vpcs[db_config.DB_VPC]
+            cluster, proxy = self.create_database(
+                db_config,
+                vpc_data['vpc'],
+                vpc_data['isolated_subnet_ids'],
+                db_config.DB_VPC,
+                ec2_instances
+            )
+
+        # Create FSx for Windows content shares from configuration
+        for fsx_config in config.FSX_LIST:
+            vpc_data = vpcs[fsx_config.FSX_VPC]
+            file_system = self.create_fsx(
+                fsx_config,
+                vpc_data['vpc'],
+                vpc_data['private_subnet_ids'],
+                ec2_instances
             )
 
 
@@ -102,8 +151,8 @@ class ComputeStack(Stack):
 # ALB - Application Load Balancer Creation
 ###############################################################################################################
 
-    def create_alb(self, alb_name, vpc, public_subnet_ids,vpc_name, sg_id=None, certificate_arn=None, SG_desc=None):
-        """Create Application Load Balancer with target group and security group"""
+    def create_alb(self, alb_name, vpc, public_subnet_ids,vpc_name, sg_id=None, certificate_arn=None, SG_desc=None, access_logs=False, access_log_prefix=None, access_log_retention_days=None, target_group_specs=None, listener_rule_specs=None):
+        """Create Application Load Balancer with target groups, listener rules and security group"""
 
         # Create or import security group for ALB
         if sg_id:
@@ -167,33 +216,64 @@ class ComputeStack(Stack):
         )
         Tags.of(alb).add("Name", alb_name)
 
-        # Create target group for EC2 instances with health checks
-        target_group = elbv2.ApplicationTargetGroup(
-            self,
-            f"{alb_name}-tg",
-            vpc=vpc,
-            port=80,
-            protocol=elbv2.ApplicationProtocol.HTTP,
-            target_type=elbv2.TargetType.INSTANCE,
-            health_check=elbv2.HealthCheck(
-                path="/",                              # Health check endpoint
-                protocol=elbv2.Protocol.HTTP,
-                port="80",
-                interval=Duration.seconds(30),          # Check every 30 seconds
-                timeout=Duration.seconds(10),           # 10 second timeout
-                healthy_threshold_count=2,              # 2 successful checks = healthy
-                unhealthy_threshold_count=5             # 5 failed checks = unhealthy
+        # Enable access logging to S3, partitioned by prefix per ALB
+        if access_logs:
+            log_bucket = s3.Bucket(
+                self,
+                f"{alb_name}-access-logs",
+                encryption=s3.BucketEncryption.S3_MANAGED,      # ALB log delivery requires SSE-S3
+                block_public_access=s3.BlockPublicAccess.BLOCK_ALL,
+                enforce_ssl=True,
+                lifecycle_rules=[
+                    s3.LifecycleRule(expiration=Duration.days(access_log_retention_days))
+                ] if access_log_retention_days else None
             )
-        )
+            log_prefix = access_log_prefix or alb_name
+            alb.log_access_logs(log_bucket, log_prefix)
+
+            # Store access log location in SSM Parameter Store for the log analyzer
+            ssm.StringParameter(
+                self,
+                f"{alb_name}-access-logs-param",
+                parameter_name=f"/{alb_name}/access-logs/s3-uri",
+                string_value=f"s3://{log_bucket.bucket_name}/{log_prefix}/",
+                description=f"Access log location for {alb_name}"
+            )
+
+        # Create target groups for EC2 instances with health checks
+        # Without specs a single 'default' group keeps the original construct ID and SSM path
+        target_groups = {}
+        for spec in target_group_specs or [config.TargetGroupSpec('default')]:
+            construct_id = f"{alb_name}-tg" if not target_group_specs else f"{alb_name}-{spec.name}-tg"
+            target_groups[spec.name] = elbv2.ApplicationTargetGroup(
+                self,
+                construct_id,
+                vpc=vpc,
+                port=80,
+                protocol=elbv2.ApplicationProtocol.HTTP,
+                target_type=elbv2.TargetType.INSTANCE,
+                health_check=elbv2.HealthCheck(
+                    path=spec.health_check_path,        # Health check endpoint
+                    protocol=elbv2.Protocol.HTTP,
+                    port="80",
+                    interval=Duration.seconds(30),      # Check every 30 seconds
+                    timeout=Duration.seconds(10),       # 10 second timeout
+                    healthy_threshold_count=2,          # 2 successful checks = healthy
+                    unhealthy_threshold_count=5         # 5 failed checks = unhealthy
+                )
+            )
+        default_target_group = next(iter(target_groups.values()))
         
 
-        # Add HTTP listener to forward traffic to target group
+        # Add HTTP listener to forward traffic to the default target group
+        listeners = []
         http_listener = alb.add_listener(
             "HttpListener",
             port=80,
             protocol=elbv2.ApplicationProtocol.HTTP,
-            default_action=elbv2.ListenerAction.forward([target_group])
+            default_action=elbv2.ListenerAction.forward([default_target_group])
         )
+        listeners.append(http_listener)
         
 
         # Add HTTPS listener if SSL certificate is provided
@@ -203,8 +283,36 @@ class ComputeStack(Stack):
                 port=443,
                 certificates=[elbv2.ListenerCertificate(certificate_arn)],
                 protocol=elbv2.ApplicationProtocol.HTTPS,
-                default_action=elbv2.ListenerAction.forward([target_group])
+                default_action=elbv2.ListenerAction.forward([default_target_group])
             )
+            listeners.append(https_listener)
+
+
+        # Add host/path-based listener rules with weighted forwarding to each listener
+        for rule in listener_rule_specs or []:
+            conditions = []
+            if rule.host_headers:
+                conditions.append(elbv2.ListenerCondition.host_headers(rule.host_headers))
+            if rule.path_patterns:
+                conditions.append(elbv2.ListenerCondition.path_patterns(rule.path_patterns))
+            if not conditions:
+                raise ValueError(f"Listener rule {rule.priority} on {alb_name} needs host_headers or path_patterns")
+
+            weighted_target_groups = []
+            for target_group_name, weight in rule.targets.items():
+                if target_group_name not in target_groups:
+                    raise ValueError(f"Listener rule {rule.priority} on {alb_name} references unknown target group {target_group_name}")
+                weighted_target_groups.append(
+                    elbv2.WeightedTargetGroup(target_group=target_groups[target_group_name], weight=weight)
+                )
+
+            for listener in listeners:
+                listener.add_action(
+                    f"Rule{rule.priority}",
+                    priority=rule.priority,
+                    conditions=conditions,
+                    action=elbv2.ListenerAction.weighted_forward(weighted_target_groups)
+                )
         
 
         # Store ALB ARN in SSM Parameter Store for reference
@@ -216,23 +324,36 @@ class ComputeStack(Stack):
             description=f"ALB ARN for {alb_name}"
         )
         
-        # Store Target Group ARN in SSM Parameter Store
-        ssm.StringParameter(
-            self,
-            f"{alb_name}-tg-param",
-            parameter_name=f"/{alb_name}/target-group/arn",
-            string_value=target_group.target_group_arn,
-            description=f"Target Group ARN for {alb_name}"
-        )
+        # Store Target Group ARNs in SSM Parameter Store
+        for target_group_name, target_group in target_groups.items():
+            if not target_group_specs:
+                ssm.StringParameter(
+                    self,
+                    f"{alb_name}-tg-param",
+                    parameter_name=f"/{alb_name}/target-group/arn",
+                    string_value=target_group.target_group_arn,
+                    description=f"Target Group ARN for {alb_name}"
+                )
+            else:
+                ssm.StringParameter(
+                    self,
+                    f"{alb_name}-{target_group_name}-tg-param",
+                    parameter_name=f"/{alb_name}/target-group/{target_group_name}/arn",
+                    string_value=target_group.target_group_arn,
+                    description=f"Target Group {target_group_name} ARN for {alb_name}"
+                )
         
-        return alb, target_group, alb_security_group
+        return alb, target_groups, alb_security_group
         
 ###############################################################################################################
 # EC2 - Elastic Compute Cloud Instance Creation
 ###############################################################################################################
 
-    def create_ec2(self,ec2_name, vpc, vpc_name, instance_type, ami_region, subnet_name, az, ami_id, key_name, ec2_alb, alb_target_groups, alb_security_groups, sg_id=None):
+    def create_ec2(self,ec2_name, vpc, vpc_name, instance_type, ami_region, subnet_name, az, ami_id, key_name, ec2_alb, alb_target_groups, alb_security_groups, sg_id=None, metrics_profile=None):
         """Create EC2 instance with IAM role, security group, and optional ALB association"""
+        # Split EC2_ALB into ALB name and optional target group ('<alb>' uses the default group)
+        alb_name, _, target_group_name = ec2_alb.partition('/') if ec2_alb is not None else (None, None, None)
+
         # Create IAM role for EC2 instance with SSM access
         ec2_role = iam.Role(
             self,
@@ -285,7 +406,7 @@ class ComputeStack(Stack):
             
             # Allow HTTP traffic from ALB if associated
             if ec2_alb is not None:
-                alb_sg = alb_security_groups[ec2_alb]
+                alb_sg = alb_security_groups[alb_name]
                 ec2_security_group.add_ingress_rule(
                      ec2.Peer.security_group_id(alb_sg.security_group_id),
                     ec2.Port.tcp(80),
@@ -312,6 +433,42 @@ class ComputeStack(Stack):
             "powershell -Command \"Install-WindowsFeature -name Web-Server -IncludeManagementTools\""
         )
 
+        # Install CloudWatch agent and load its config from SSM if a metrics profile is set
+        if metrics_profile is not None:
+            agent_config = json.dumps(self.build_cloudwatch_agent_config(metrics_profile))
+            agent_config_param = ssm.StringParameter(
+                self,
+                f"{ec2_name}-cw-agent-config-param",
+                parameter_name=f"/{ec2_name}/cloudwatch-agent/config",
+                string_value=agent_config,
+                tier=ssm.ParameterTier.ADVANCED if len(agent_config) > 4096 else ssm.ParameterTier.STANDARD,
+                description=f"CloudWatch agent config ({metrics_profile.PROFILE_NAME}) for {ec2_name}"
+            )
+
+            # Allow the agent to read its config and publish to the profile namespace only
+            agent_config_param.grant_read(ec2_role)
+            ec2_role.add_to_policy(iam.PolicyStatement(
+                actions=["cloudwatch:PutMetricData"],
+                resources=["*"],
+                conditions={"StringEquals": {"cloudwatch:namespace": metrics_profile.NAMESPACE}}
+            ))
+            ec2_role.add_to_policy(iam.PolicyStatement(
+                actions=["ec2:DescribeTags", "ec2:DescribeVolumes"],
+                resources=["*"]
+            ))
+
+            # ASP.NET counter objects only exist once the ASP.NET feature is installed
+            if any(counter_spec.object_name.startswith('ASP.NET') for counter_spec in metrics_profile.COUNTERS):
+                user_data.add_commands(
+                    "Install-WindowsFeature -name Web-Asp-Net45"
+                )
+
+            user_data.add_commands(
+                "Invoke-WebRequest -UseBasicParsing -Uri https://amazoncloudwatch-agent.s3.amazonaws.com/windows/amd64/latest/amazon-cloudwatch-agent.msi -OutFile $env:TEMP\\amazon-cloudwatch-agent.msi",
+                "Start-Process msiexec.exe -ArgumentList '/i', \"$env:TEMP\\amazon-cloudwatch-agent.msi\", '/qn' -Wait",
+                f"& \"$env:ProgramFiles\\Amazon\\AmazonCloudWatchAgent\\amazon-cloudwatch-agent-ctl.ps1\" -a fetch-config -m ec2 -s -c ssm:{agent_config_param.parameter_name}"
+            )
+
         # Create EC2 instance with specified configuration
         instance = ec2.Instance(
                 self,
@@ -326,12 +483,351 @@ class ComputeStack(Stack):
                 role=ec2_role                           # IAM role for permissions
             )
 
-        # Register instance with ALB target group if specified
+        # Register instance with ALB target group if specified ('<alb>' uses the default group)
         if ec2_alb is not None:
-            target_group = alb_target_groups[ec2_alb]
+            target_groups = alb_target_groups[alb_name]
+            if target_group_name and target_group_name not in target_groups:
+                raise ValueError(f"{ec2_name} references unknown target group {target_group_name} on {alb_name}")
+            target_group = target_groups[target_group_name] if target_group_name else next(iter(target_groups.values()))
             target_group.add_target(targets.InstanceTarget(instance))
 
         # Add name tag to instance
         Tags.of(instance).add("Name", ec2_name)
 
-        return instance
\ No newline at end of file
+        return instance
+
+###############################################################################################################
+# RDS - Aurora Cluster with RDS Proxy Creation
+###############################################################################################################
+
+    def create_database(self, db_config, vpc, isolated_subnet_ids, vpc_name, ec2_instances):
+        """Create Aurora cluster in isolated subnets fronted by an RDS Proxy for connection pooling"""
+        db_name = db_config.DB_NAME
+
+        # Every client must be an instance created from EC2_LIST
+        for client_name in db_config.DB_CLIENTS:
+            if client_name not in ec2_instances:
+                raise ValueError(f"{db_name} references unknown DB client {client_name}, not found in EC2_LIST")
+
+        # Map engine names to CDK cluster engines and their default ports
+        # Aurora MySQL versions look like 8.0.mysql_aurora.3.04.0; the first two parts are the major version
+        engine_map = {
+            'aurora-postgresql': lambda version: rds.DatabaseClusterEngine.aurora_postgres(
+                version=rds.AuroraPostgresEngineVersion.of(version, version.split('.')[0])
+            ),
+            'aurora-mysql': lambda version: rds.DatabaseClusterEngine.aurora_mysql(
+                version=rds.AuroraMysqlEngineVersion.of(version, '.'.join(version.split('.')[:2]))
+            )
+        }
+        port_map = {
+            'aurora-postgresql': 5432,
+            'aurora-mysql': 3306
+        }
+        if db_config.DB_ENGINE not in engine_map:
+            raise ValueError(f"Unsupported engine {db_config.DB_ENGINE} for {db_name}. Supported: {', '.join(engine_map)}")
+        engine = engine_map[db_config.DB_ENGINE](db_config.DB_ENGINE_VERSION)
+        db_port = port_map[db_config.DB_ENGINE]
+
+        # Build list of isolated subnets for cluster and proxy deployment
+        isolated_subnets = []
+        for i, subnet_id in enumerate(isolated_subnet_ids):
+            # Lookup availability zone from SSM parameter
+            az = ssm.StringParameter.value_from_lookup(
+                self, 
+                f"/{vpc_name}/isolated-subnet-{i+1}/az"
+            )
+            # Create subnet reference for the database
+            isolated_subnets.append(
+                ec2.Subnet.from_subnet_attributes(
+                    self, 
+                    f"{db_name}-IsolatedSubnet{i+1}",
+                    subnet_id=subnet_id,
+                    availability_zone=az
+                )
+            )
+        if not isolated_subnets:
+            raise ValueError(f"VPC {vpc_name} has no isolated subnets for {db_name}")
+
+        # Security group for the proxy, reachable only from client EC2 instances
+        proxy_security_group = ec2.SecurityGroup(
+            self,
+            f"{db_name}-proxy-sg",
+            vpc=vpc,
+            allow_all_outbound=True,
+            description=f"Security group for {db_name} proxy"
+        )
+        for client_name in db_config.DB_CLIENTS:
+            # Allow database traffic from each client instance security group
+            for client_sg in ec2_instances[client_name].connections.security_groups:
+                proxy_security_group.add_ingress_rule(
+                    client_sg,
+                    ec2.Port.tcp(db_port),
+                    f"Allow database traffic from {client_name}"
+                )
+
+        # Security group for the cluster, reachable only from the proxy
+        db_security_group = ec2.SecurityGroup(
+            self,
+            f"{db_name}-sg",
+            vpc=vpc,
+            allow_all_outbound=False,
+            description=f"Security group for {db_name}"
+        )
+        db_security_group.add_ingress_rule(
+            ec2.Peer.security_group_id(proxy_security_group.security_group_id),
+            ec2.Port.tcp(db_port),
+            "Allow database traffic from RDS Proxy"
+        )
+
+        # Create Aurora cluster with one writer and the configured number of readers
+        cluster = rds.DatabaseCluster(
+            self,
+            db_name,
+            engine=engine,
+            port=db_port,
+            default_database_name=db_config.DB_DATABASE_NAME,
+            credentials=rds.Credentials.from_generated_secret("dbadmin"),
+            instances=1 + db_config.DB_READ_REPLICAS,   # Writer plus readers
+            instance_props=rds.InstanceProps(
+                vpc=vpc,
+                instance_type=ec2.InstanceType(db_config.DB_INSTANCE_TYPE),
+                vpc_subnets=ec2.SubnetSelection(subnets=isolated_subnets),
+                security_groups=[db_security_group]
+            ),
+            storage_encrypted=True
+        )
+        Tags.of(cluster).add("Name", db_name)
+
+        # Create RDS Proxy to pool and multiplex client connections
+        proxy = cluster.add_proxy(
+            f"{db_name}-proxy",
+            secrets=[cluster.secret],
+            vpc=vpc,
+            vpc_subnets=ec2.SubnetSelection(subnets=isolated_subnets),
+            security_groups=[proxy_security_group],
+            require_tls=True,
+            max_connections_percent=db_config.PROXY_MAX_CONNECTIONS_PERCENT,
+            max_idle_connections_percent=db_config.PROXY_MAX_IDLE_CONNECTIONS_PERCENT,
+            borrow_timeout=Duration.seconds(db_config.PROXY_BORROW_TIMEOUT),
+            idle_client_timeout=Duration.seconds(db_config.PROXY_IDLE_CLIENT_TIMEOUT)
+        )
+
+        # Allow client instances to read the database credentials
+        for client_name in db_config.DB_CLIENTS:
+            cluster.secret.grant_read(ec2_instances[client_name].role)
+
+        # Store endpoints in SSM Parameter Store for the instances
+        db_parameters = {
+            'proxy/endpoint': (proxy.endpoint, "RDS Proxy endpoint"),
+            'writer/endpoint': (cluster.cluster_endpoint.hostname, "Cluster writer endpoint"),
+            'reader/endpoint': (cluster.cluster_read_endpoint.hostname, "Cluster reader endpoint"),
+            'port': (str(db_port), "Database port"),
+            'secret/arn': (cluster.secret.secret_arn, "Database credentials secret ARN")
+        }
+
+        # Add read-only proxy endpoint to pool connections to the readers
+        if db_config.DB_READ_REPLICAS > 0:
+            proxy_reader_endpoint = rds.CfnDBProxyEndpoint(
+                self,
+                f"{db_name}-proxy-reader",
+                db_proxy_name=proxy.db_proxy_name,
+                db_proxy_endpoint_name=f"{db_name}-reader",
+                vpc_subnet_ids=isolated_subnet_ids,
+                vpc_security_group_ids=[proxy_security_group.security_group_id],
+                target_role="READ_ONLY"
+            )
+            db_parameters['proxy/reader-endpoint'] = (
+                proxy_reader_endpoint.attr_endpoint, "RDS Proxy read-only endpoint"
+            )
+
+        for parameter_path, (value, description) in db_parameters.items():
+            ssm.StringParameter(
+                self,
+                f"{db_name}-{parameter_path.replace('/', '-')}-param",
+                parameter_name=f"/{db_name}/{parameter_path}",
+                string_value=value,
+                description=f"{description} for {db_name}"
+            )
+
+        return cluster, proxy
+
+###############################################################################################################
+# FSx - FSx for Windows File Server Shared Content Creation
+###############################################################################################################
+
+    def create_fsx(self, fsx_config, vpc, private_subnet_ids, ec2_instances):
+        """Create FSx for Windows File Server in private subnets and point client IIS sites at the share"""
+        fsx_name = fsx_config.FSX_NAME
+
+        # Every client must be an instance created from EC2_LIST
+        for client_name in fsx_config.FSX_CLIENTS:
+            if client_name not in ec2_instances:
+                raise ValueError(f"{fsx_name} references unknown FSx client {client_name}, not found in EC2_LIST")
+
+        # SINGLE_AZ_2 and MULTI_AZ_1 accept 32-2048 MB/s in powers of two, plus the larger 3072-12288 tiers
+        throughput_capacities = [32, 64, 128, 256, 512, 1024, 2048, 3072, 4608, 6144, 9216, 12288]
+        if fsx_config.FSX_THROUGHPUT_CAPACITY not in throughput_capacities:
+            raise ValueError(f"Unsupported throughput capacity {fsx_config.FSX_THROUGHPUT_CAPACITY} for {fsx_name}. Supported: {', '.join(map(str, throughput_capacities))}")
+
+        # Multi-AZ needs a preferred and a standby subnet, single-AZ only one
+        subnet_count = 2 if fsx_config.FSX_DEPLOYMENT_TYPE == 'MULTI_AZ_1' else 1
+        subnet_ids = private_subnet_ids[:subnet_count]
+
+        # Exactly one of AWS Managed AD or self-managed AD must be configured
+        if bool(fsx_config.FSX_ACTIVE_DIRECTORY_ID) == bool(fsx_config.FSX_SELF_MANAGED_AD):
+            raise ValueError(f"{fsx_name} needs exactly one of FSX_ACTIVE_DIRECTORY_ID or FSX_SELF_MANAGED_AD")
+        if fsx_config.FSX_ACTIVE_DIRECTORY_ID and not (fsx_config.FSX_DIRECTORY_NAME and fsx_config.FSX_DIRECTORY_DNS_IPS):
+            raise ValueError(f"{fsx_name} needs FSX_DIRECTORY_NAME and FSX_DIRECTORY_DNS_IPS to join clients to {fsx_config.FSX_ACTIVE_DIRECTORY_ID}")
+        self_managed_ad = None
+        if fsx_config.FSX_SELF_MANAGED_AD:
+            ad = fsx_config.FSX_SELF_MANAGED_AD
+            self_managed_ad = fsx.CfnFileSystem.SelfManagedActiveDirectoryConfigurationProperty(
+                domain_name=ad.domain_name,
+                dns_ips=ad.dns_ips,
+                user_name=ad.user_name,
+                password=SecretValue.secrets_manager(ad.password_secret_arn).unsafe_unwrap(),  # Resolved by CloudFormation
+                organizational_unit_distinguished_name=ad.organizational_unit,
+                file_system_administrators_group=ad.admins_group
+            )
+
+        # Security group for the file system, reachable over SMB from client EC2 instances
+        fsx_security_group = ec2.SecurityGroup(
+            self,
+            f"{fsx_name}-sg",
+            vpc=vpc,
+            allow_all_outbound=True,                # Outbound to domain controllers
+            description=f"Security group for {fsx_name}"
+        )
+        for client_name in fsx_config.FSX_CLIENTS:
+            # Allow SMB traffic from each client instance security group
+            for client_sg in ec2_instances[client_name].connections.security_groups:
+                fsx_security_group.add_ingress_rule(
+                    client_sg,
+                    ec2.Port.tcp(445),
+                    f"Allow SMB traffic from {client_name}"
+                )
+
+        # Create FSx for Windows File Server on SSD storage
+        file_system = fsx.CfnFileSystem(
+            self,
+            fsx_name,
+            file_system_type="WINDOWS",
+            storage_type="SSD",
+            storage_capacity=fsx_config.FSX_STORAGE_CAPACITY,
+            subnet_ids=subnet_ids,
+            security_group_ids=[fsx_security_group.security_group_id],
+            windows_configuration=fsx.CfnFileSystem.WindowsConfigurationProperty(
+                deployment_type=fsx_config.FSX_DEPLOYMENT_TYPE,
+                throughput_capacity=fsx_config.FSX_THROUGHPUT_CAPACITY,
+                preferred_subnet_id=subnet_ids[0] if subnet_count > 1 else None,
+                active_directory_id=fsx_config.FSX_ACTIVE_DIRECTORY_ID,
+                self_managed_active_directory_configuration=self_managed_ad
+            )
+        )
+        Tags.of(file_system).add("Name", fsx_name)
+
+        # Join clients to the AWS Managed AD through SSM; the document reboots the instance after joining
+        if fsx_config.FSX_ACTIVE_DIRECTORY_ID:
+            for client_name in fsx_config.FSX_CLIENTS:
+                ec2_instances[client_name].role.add_managed_policy(
+                    iam.ManagedPolicy.from_aws_managed_policy_name("AmazonSSMDirectoryServiceAccess")
+                )
+            ssm.CfnAssociation(
+                self,
+                f"{fsx_name}-domain-join",
+                name="AWS-JoinDirectoryServiceDomain",
+                parameters={
+                    "directoryId": [fsx_config.FSX_ACTIVE_DIRECTORY_ID],
+                    "directoryName": [fsx_config.FSX_DIRECTORY_NAME],
+                    "dnsIpAddresses": fsx_config.FSX_DIRECTORY_DNS_IPS
+                },
+                targets=[ssm.CfnAssociation.TargetProperty(
+                    key="InstanceIds",
+                    values=[ec2_instances[client_name].instance_id for client_name in fsx_config.FSX_CLIENTS]
+                )]
+            )
+
+        # IIS mounts the share by serving the site straight from its UNC path. Mapped drive letters are
+        # per logon session and invisible to IIS worker processes, so no drive is mapped.
+        # User data runs before the domain join, so it only registers a SYSTEM task that switches the
+        # site once the instance is domain-joined and the share is reachable. Until then, or if the
+        # switch fails, the site keeps serving local content and the ALB health check keeps passing.
+        content_path = f"\\\\{file_system.attr_dns_name}\\{fsx_config.FSX_CONTENT_PATH}"
+        task_name = f"Mount-{fsx_name}-IisContent"
+        script_path = f"$env:ProgramData\\Amazon\\{task_name}.ps1"
+        for client_name in fsx_config.FSX_CLIENTS:
+            ec2_instances[client_name].user_data.add_commands(
+                f"New-Item -ItemType Directory -Force -Path \"$env:ProgramData\\Amazon\" | Out-Null",
+                f"Set-Content -Path \"{script_path}\" -Value @'",
+                "$ErrorActionPreference = 'Stop'",
+                "if (-not (Get-CimInstance Win32_ComputerSystem).PartOfDomain) { exit 0 }",
+                "try {",
+                f"    if (-not (Test-Path '{content_path}')) {{ New-Item -ItemType Directory -Force -Path '{content_path}' | Out-Null }}",
+                f"    if (-not (Get-ChildItem '{content_path}')) {{ Copy-Item \"$env:SystemDrive\\inetpub\\wwwroot\\*\" '{content_path}' -Recurse }}",
+                "    Import-Module WebAdministration",
+                f"    Set-WebConfigurationProperty -PSPath 'IIS:\\' -Location '{fsx_config.FSX_IIS_SITE}' -Filter /system.webServer/security/authentication/anonymousAuthentication -Name userName -Value ''",
+                f"    Set-ItemProperty 'IIS:\\Sites\\{fsx_config.FSX_IIS_SITE}' -Name physicalPath -Value '{content_path}'",
+                f"    Unregister-ScheduledTask -TaskName '{task_name}' -Confirm:$false",
+                "} catch { Write-Output $_ }",
+                "'@",
+                f"$action = New-ScheduledTaskAction -Execute powershell.exe -Argument \"-NoProfile -ExecutionPolicy Bypass -File `\"{script_path}`\"\"",
+                "$triggers = @((New-ScheduledTaskTrigger -AtStartup), (New-ScheduledTaskTrigger -Once -At (Get-Date) -RepetitionInterval (New-TimeSpan -Minutes 5)))",
+                f"Register-ScheduledTask -TaskName '{task_name}' -Action $action -Trigger $triggers -User SYSTEM -RunLevel Highest -Force"
+            )
+
+        # Store file system details in SSM Parameter Store for the instances
+        ssm.StringParameter(
+            self,
+            f"{fsx_name}-id-param",
+            parameter_name=f"/{fsx_name}/id",
+            string_value=file_system.ref,
+            description=f"File system ID for {fsx_name}"
+        )
+        ssm.StringParameter(
+            self,
+            f"{fsx_name}-dns-param",
+            parameter_name=f"/{fsx_name}/dns-name",
+            string_value=file_system.attr_dns_name,
+            description=f"DNS name for {fsx_name}"
+        )
+        ssm.StringParameter(
+            self,
+            f"{fsx_name}-content-path-param",
+            parameter_name=f"/{fsx_name}/content-path",
+            string_value=content_path,
+            description=f"IIS content UNC path for {fsx_name}"
+        )
+
+        return file_system
+
+###############################################################################################################
+# CloudWatch Agent - Metrics Configuration Rendering
+###############################################################################################################
+
+    def build_cloudwatch_agent_config(self, metrics_profile):
+        """Render CloudWatch agent config for Windows performance counters from a metrics profile"""
+        metrics_collected = {}
+        for counter_spec in metrics_profile.COUNTERS:
+            # Merge counters when the same performance object appears more than once
+            collected = metrics_collected.setdefault(counter_spec.object_name, {"measurement": []})
+            for counter in counter_spec.counters:
+                if counter not in collected["measurement"]:
+                    collected["measurement"].append(counter)
+            if counter_spec.instances:
+                collected["resources"] = counter_spec.instances
+
+        return {
+            "agent": {
+                "metrics_collection_interval": metrics_profile.COLLECTION_INTERVAL
+            },
+            "metrics": {
+                "namespace": metrics_profile.NAMESPACE,
+                "append_dimensions": {
+                    "InstanceId": "${aws:InstanceId}",
+                    "InstanceType": "${aws:InstanceType}",
+                    "ImageId": "${aws:ImageId}"
+                },
+                "aggregation_dimensions": metrics_profile.AGGREGATION_DIMENSIONS,
+                "metrics_collected": metrics_collected
+            }
+        }
@@ -4,7 +4,7 @@
 
 from dataclasses import dataclass, field
 import uuid
-from typing import List
+from typing import Dict, List
 import common_config
 from aws_cdk import (
     aws_ec2 as ec2,
@@ -16,6 +16,20 @@ ENV = common_config.ENV
 COMMON_NAME = common_config.COMMON_NAME
 APP_NAME = common_config.APP_NAME
 
+@dataclass
+class TargetGroupSpec:
+    """Specification for an ALB target group of IIS instances (HTTP on port 80)"""
+    name: str                       # Target group name, referenced by EC2_ALB as '<alb>/<name>'
+    health_check_path: str = '/'    # Health check endpoint
+
+@dataclass
+class ListenerRuleSpec:
+    """Specification for a host/path-based listener rule with weighted forwarding"""
+    priority: int                   # Rule priority (1-50000, lower is evaluated first)
+    targets: Dict[str, int]         # Target group name -> weight (0-999), e.g. canary splits
+    host_headers: List[str] = None  # Host header values to match (None to match any host)
+    path_patterns: List[str] = None # Path patterns to match (None to match any path)
+
 @dataclass
 class ALBConfig:
     """Configuration class for Application Load Balancer (ALB) settings"""
@@ -25,6 +39,27 @@ class ALBConfig:
     ALB_SG_ID: str          # Security Group ID for ALB (None for auto-creation)
     CERTIFICATE_ARN: str    # SSL certificate ARN for HTTPS listeners
     SG_DESC: str            # Description for the security group
+    ACCESS_LOGS: bool       # Enable access logging to an S3 bucket
+    ACCESS_LOG_PREFIX: str  # S3 key prefix for access logs (None to use the ALB name)
+    ACCESS_LOG_RETENTION_DAYS: int  # Days before access log objects expire
+    TARGET_GROUPS: List[TargetGroupSpec]    # Target groups (None for a single 'default' group; first is the default action)
+    LISTENER_RULES: List[ListenerRuleSpec]  # Listener rules applied to HTTP and HTTPS listeners (None for none)
+
+@dataclass
+class CounterSpec:
+    """Windows performance object and counters collected by the CloudWatch agent"""
+    object_name: str                # Performance object (e.g., Memory, LogicalDisk)
+    counters: List[str]             # Counter names within the object
+    instances: List[str] = None     # Object instances (None for single-instance objects)
+
+@dataclass
+class MetricsProfile:
+    """Configuration class for CloudWatch agent metric collection"""
+    PROFILE_NAME: str                           # Name of the metrics profile
+    NAMESPACE: str                              # CloudWatch namespace for published metrics
+    COLLECTION_INTERVAL: int                    # Collection interval in seconds
+    COUNTERS: List[CounterSpec]                 # Performance counters to collect
+    AGGREGATION_DIMENSIONS: List[List[str]]     # Dimension sets to aggregate on ([] for fleet-wide)
 
 @dataclass
 class EC2Config:
@@ -38,10 +73,90 @@ class EC2Config:
     EC2_SUBNET_NAME: str        # Subnet name to lookup (None for random selection)
     EC2_AZ: str                 # Availability zone for instance placement
     AMI_ID: str                 # Amazon Machine Image ID
-    EC2_ALB: str                # Associated ALB name (None if no ALB)
+    EC2_ALB: str                # Associated ALB name or '<alb>/<target-group>' (None if no ALB)
     EC2_KEYPAIR: str            # SSH keypair name (None if no access)
+    EC2_METRICS_PROFILE: MetricsProfile  # CloudWatch agent metrics profile (None to disable)
+
+@dataclass
+class DatabaseConfig:
+    """Configuration class for Aurora cluster and RDS Proxy settings"""
+    DB_NAME: str                            # Name of the Aurora cluster and proxy
+    DB_VPC: str                             # VPC whose isolated subnets host the cluster
+    DB_ENGINE: str                          # Engine: 'aurora-postgresql' or 'aurora-mysql'
+    DB_ENGINE_VERSION: str                  # Full engine version (e.g., 14.6 or 8.0.mysql_aurora.3.04.0)
+    DB_INSTANCE_TYPE: str                   # Instance type for writer and readers (e.g., r6g.large)
+    DB_READ_REPLICAS: int                   # Number of reader instances (0 for writer only)
+    DB_DATABASE_NAME: str                   # Default database created in the cluster
+    DB_CLIENTS: List[str]                   # EC2 names allowed to connect through the proxy
+    PROXY_MAX_CONNECTIONS_PERCENT: int      # Share of max_connections the proxy may open
+    PROXY_MAX_IDLE_CONNECTIONS_PERCENT: int # Share of max_connections kept idle in the pool
+    PROXY_BORROW_TIMEOUT: int               # Seconds a client waits for a pooled connection
+    PROXY_IDLE_CLIENT_TIMEOUT: int          # Seconds before an idle client connection is closed
+
+@dataclass
+class ActiveDirectorySpec:
+    """Specification for joining FSx to a self-managed Active Directory"""
+    domain_name: str                        # Fully qualified domain name (e.g., corp.example.com)
+    dns_ips: List[str]                      # Domain controller DNS server IPs
+    user_name: str                          # Service account allowed to join computers to the domain
+    password_secret_arn: str                # Secrets Manager ARN holding the service account password
+    organizational_unit: str = None         # OU distinguished name (None for the default Computers OU)
+    admins_group: str = None                # File system administrators group (None for Domain Admins)
+
+@dataclass
+class FSxConfig:
+    """Configuration class for FSx for Windows File Server content shares"""
+    FSX_NAME: str                           # Name of the file system
+    FSX_VPC: str                            # VPC whose private subnets host the file system
+    FSX_DEPLOYMENT_TYPE: str                # 'SINGLE_AZ_2' or 'MULTI_AZ_1'
+    FSX_STORAGE_CAPACITY: int               # SSD storage capacity in GiB (32-65536)
+    FSX_THROUGHPUT_CAPACITY: int            # Throughput capacity in MB/s: 32, 64, ... 2048 (or up to 12288 on newer types)
+    FSX_ACTIVE_DIRECTORY_ID: str            # AWS Managed Microsoft AD directory ID (None for self-managed AD)
+    FSX_SELF_MANAGED_AD: ActiveDirectorySpec  # Self-managed AD settings (None for AWS Managed AD)
+    FSX_DIRECTORY_NAME: str                 # AWS Managed AD domain name used to join clients (None for self-managed AD)
+    FSX_DIRECTORY_DNS_IPS: List[str]        # AWS Managed AD DNS IPs used to join clients (None for self-managed AD)
+    FSX_CLIENTS: List[str]                  # EC2 names that serve IIS content from the share (opt-in; must be domain-joined)
+    FSX_CONTENT_PATH: str                   # Folder on the file system served by IIS (e.g., share\wwwroot)
+    FSX_IIS_SITE: str                       # IIS site whose physical path points at the share
+
 
 
+# Base Windows counters: memory, paging, CPU, disk queues and TCP connections
+WINDOWS_BASE_COUNTERS = [
+    CounterSpec('Memory', ['% Committed Bytes In Use', 'Available MBytes', 'Pages/sec']),
+    CounterSpec('Paging File', ['% Usage'], ['*']),
+    CounterSpec('Processor', ['% Processor Time'], ['_Total']),
+    CounterSpec('LogicalDisk', ['% Free Space', 'Avg. Disk Queue Length', 'Avg. Disk sec/Read', 'Avg. Disk sec/Write'], ['*']),
+    CounterSpec('PhysicalDisk', ['Current Disk Queue Length', 'Disk Bytes/sec'], ['*']),
+    CounterSpec('TCPv4', ['Connections Established'])
+]
+
+# IIS and ASP.NET counters: request queues, rejections and worker throughput
+IIS_COUNTERS = [
+    CounterSpec('Web Service', ['Current Connections', 'Total Method Requests/sec'], ['_Total']),
+    CounterSpec('HTTP Service Request Queues', ['CurrentQueueSize', 'RejectedRequests'], ['*']),
+    CounterSpec('ASP.NET', ['Requests Queued', 'Requests Rejected', 'Request Wait Time', 'Application Restarts']),
+    CounterSpec('ASP.NET Applications', ['Requests/Sec', 'Requests Executing', 'Errors Total/Sec'], ['__Total__'])
+]
+
+# Metrics profile for standalone Windows servers
+METRICS_WINDOWS_BASE = MetricsProfile(
+    PROFILE_NAME='windows-base',                # Profile name
+    NAMESPACE=f'{ENV}/{COMMON_NAME}/Windows',   # Dynamic namespace per environment
+    COLLECTION_INTERVAL=60,                     # Collect every minute
+    COUNTERS=WINDOWS_BASE_COUNTERS,             # OS counters only
+    AGGREGATION_DIMENSIONS=[['InstanceId']]     # Per-instance metrics
+)
+
+# Metrics profile for IIS web servers behind the ALB
+METRICS_IIS = MetricsProfile(
+    PROFILE_NAME='iis',                         # Profile name
+    NAMESPACE=f'{ENV}/{COMMON_NAME}/IIS',       # Dynamic namespace per environment
+    COLLECTION_INTERVAL=30,                     # Finer interval to catch request queue spikes
+    COUNTERS=WINDOWS_BASE_COUNTERS + IIS_COUNTERS,  # OS plus IIS and ASP.NET counters
+    AGGREGATION_DIMENSIONS=[['InstanceId'], []] # Per-instance and fleet-wide metrics
+)
+
 
 # Application Load Balancer configuration for exchange environment
 ALB_EXCHANGE = ALBConfig(
@@ -50,7 +165,12 @@ ALB_EXCHANGE = ALBConfig(
     ALB_VPC=f'{ENV}-{COMMON_NAME}-vpc',         # Target VPC for ALB deployment
     ALB_SG_ID=None,                             # Auto-create security group
     CERTIFICATE_ARN=None,                       # No SSL certificate configured
-    SG_DESC='Description'                       # Security group description
+    SG_DESC='Description',                      # Security group description
+    ACCESS_LOGS=True,                           # Write access logs to S3
+    ACCESS_LOG_PREFIX=None,                     # Partition logs under the ALB name
+    ACCESS_LOG_RETENTION_DAYS=90,               # Keep access logs for 90 days
+    TARGET_GROUPS=None,                         # Single default target group
+    LISTENER_RULES=None                         # Forward all traffic to the default target group
 )
 
 # ALB_DEV = ALBConfig(
@@ -59,7 +179,19 @@ ALB_EXCHANGE = ALBConfig(
 #     VPC_NAME=f'dev-{COMMON_NAME}-vpc',
 #     ALB_SG_ID= None,
 #     CERTIFICATE_ARN= None,
-#     SG_DESC='Description'
+#     SG_DESC='Description',
+#     ACCESS_LOGS=False,
+#     ACCESS_LOG_PREFIX=None,
+#     ACCESS_LOG_RETENTION_DAYS=30,
+#     TARGET_GROUPS=[
+#         TargetGroupSpec('web'),                                     # Default action target group
+#         TargetGroupSpec('web-canary'),                              # Canary release of the web app
+#         TargetGroupSpec('api', health_check_path='/health')         # Second app on the same ALB
+#     ],
+#     LISTENER_RULES=[
+#         ListenerRuleSpec(10, {'api': 1}, host_headers=['api.example.com']),
+#         ListenerRuleSpec(20, {'web': 90, 'web-canary': 10}, path_patterns=['/owa/*'])
+#     ]
 # )
 
 
@@ -73,8 +205,9 @@ ALB_EXCHANGE = ALBConfig(
 #     EC2_AZ='eu-central-1a',                     # Define Availability zone the EC2 will be deployed
 #     AMI_ID='ami-016c25765a1fa5a76',             # Windows AMI
 #     INSTANCE_IDS=[],                            # Will be populated after creation
-#     EC2_ALB=f'{ENV}-{COMMON_NAME}-alb',         # Associate with ALB for load balancing, if None EC2 will not be under ALB
-#     EC2_KEYPAIR='test-keypair'                  # Define existing Keypair name, if None EC2 will not have Keypair
+#     EC2_ALB=f'{ENV}-{COMMON_NAME}-alb/web',     # Associate with ALB target group ('<alb>' uses the default), if None EC2 will not be under ALB
+#     EC2_KEYPAIR='test-keypair',                 # Define existing Keypair name, if None EC2 will not have Keypair
+#     EC2_METRICS_PROFILE=METRICS_IIS             # Define CloudWatch agent metrics profile, if None agent is not installed
 # )
 
 # First EC2 instance configuration for exchange application
@@ -89,7 +222,8 @@ EC2_EXCHANGE_1 = EC2Config(
     AMI_ID='ami-016c25765a1fa5a76',             # Windows AMI
     INSTANCE_IDS=[],                            # Will be populated after creation
     EC2_ALB=f'{ENV}-{COMMON_NAME}-alb',         # Associate with ALB for load balancing
-    EC2_KEYPAIR='test-keypair'                  # SSH key for instance access
+    EC2_KEYPAIR='test-keypair',                 # SSH key for instance access
+    EC2_METRICS_PROFILE=METRICS_IIS             # IIS and ASP.NET counters
 )
 
 # Second EC2 instance configuration for exchange application (high availability)
@@ -104,7 +238,8 @@ EC2_EXCHANGE_2 = EC2Config(
     AMI_ID='ami-016c25765a1fa5a76',             # Same AMI as first instance
     INSTANCE_IDS=[],                            # Will be populated after creation
     EC2_ALB=f'{ENV}-{COMMON_NAME}-alb',         # Same ALB for load distribution
-    EC2_KEYPAIR='test-keypair'                  # Define existing Keypair
+    EC2_KEYPAIR='test-keypair',                 # Define existing Keypair
+    EC2_METRICS_PROFILE=METRICS_IIS             # IIS and ASP.NET counters
 )
 
 # Domain Controller server configuration (standalone instance)
@@ -119,14 +254,62 @@ DC_SERVER_1 = EC2Config(
     AMI_ID='ami-016c25765a1fa5a76',             # Same base AMI
     INSTANCE_IDS=[],                            # Will be populated after creation
     EC2_ALB=None,                               # No load balancer (standalone service)
-    EC2_KEYPAIR='test-keypair'                  # Define existing Keypair
+    EC2_KEYPAIR='test-keypair',                 # Define existing Keypair
+    EC2_METRICS_PROFILE=METRICS_WINDOWS_BASE    # OS counters only
+)
+
+
+# Aurora cluster behind RDS Proxy for the exchange web tier
+DB_EXCHANGE = DatabaseConfig(
+    DB_NAME=f'{ENV}-{COMMON_NAME}-db',          # Dynamic cluster name
+    DB_VPC=f'{ENV}-{COMMON_NAME}-vpc',          # Deployed in the isolated subnets of this VPC
+    DB_ENGINE='aurora-postgresql',              # Aurora PostgreSQL engine
+    DB_ENGINE_VERSION='14.6',                   # Engine version
+    DB_INSTANCE_TYPE='r6g.large',               # Writer and reader instance type
+    DB_READ_REPLICAS=1,                         # One reader behind the reader endpoint
+    DB_DATABASE_NAME='exchange',                # Default database name
+    DB_CLIENTS=[                                # Web tier instances using the proxy
+        f'{ENV}-{COMMON_NAME}-ec2',
+        f'{ENV}-{COMMON_NAME}-ec2-2'
+    ],
+    PROXY_MAX_CONNECTIONS_PERCENT=90,           # Leave headroom for admin connections
+    PROXY_MAX_IDLE_CONNECTIONS_PERCENT=50,      # Keep half the pool warm
+    PROXY_BORROW_TIMEOUT=30,                    # Wait up to 30 seconds for a connection
+    PROXY_IDLE_CLIENT_TIMEOUT=1800              # Close idle clients after 30 minutes
 )
 
 
+# Shared IIS content store for the exchange web tier
+# Requires an existing AWS Managed Microsoft AD; add to FSX_LIST once the directory values are filled in
+# FSX_EXCHANGE = FSxConfig(
+#     FSX_NAME=f'{ENV}-{COMMON_NAME}-fsx',        # Dynamic file system name
+#     FSX_VPC=f'{ENV}-{COMMON_NAME}-vpc',         # Deployed in the private subnets of this VPC
+#     FSX_DEPLOYMENT_TYPE='MULTI_AZ_1',           # Standby file server in a second AZ
+#     FSX_STORAGE_CAPACITY=32,                    # Minimum SSD capacity
+#     FSX_THROUGHPUT_CAPACITY=32,                 # 32 MB/s throughput
+#     FSX_ACTIVE_DIRECTORY_ID='d-xxxxxxxxxx',     # Define existing AWS Managed Microsoft AD directory ID
+#     FSX_SELF_MANAGED_AD=None,                   # Not joined to a self-managed AD
+#     FSX_DIRECTORY_NAME='corp.example.com',      # Define directory domain name, clients are joined to it via SSM
+#     FSX_DIRECTORY_DNS_IPS=['10.0.0.10', '10.0.0.20'],  # Define directory DNS IPs
+#     FSX_CLIENTS=[                               # Web tier instances serving content from the share
+#         f'{ENV}-{COMMON_NAME}-ec2',
+#         f'{ENV}-{COMMON_NAME}-ec2-2'
+#     ],
+#     FSX_CONTENT_PATH='share\\wwwroot',          # Site content under the default share
+#     FSX_IIS_SITE='Default Web Site'             # Default IIS site
+# )
+
+
 # Configuration lists for infrastructure deployment
 # List of all ALB configurations to be created
 ALB_LIST = [ALB_EXCHANGE]
 
 # List of all EC2 configurations to be created
 # Includes exchange application instances and domain controller
-EC2_LIST = [EC2_EXCHANGE_1, EC2_EXCHANGE_2, DC_SERVER_1]
\ No newline at end of file
+EC2_LIST = [EC2_EXCHANGE_1, EC2_EXCHANGE_2, DC_SERVER_1]
+
+# List of all database configurations to be created
+DB_LIST = [DB_EXCHANGE]
+
+# List of all shared storage configurations to be created
+FSX_LIST = []
\ No newline at end of file
@@ -168,6 +168,23 @@ class NetworkStack(Stack):
                 description=f"Private Subnet {i+1} AZ for {vpc_name}"
             )
         
+        # Store isolated subnet IDs and availability zones in SSM
+        for i, subnet in enumerate(self.vpc.isolated_subnets):
+            # Store subnet ID
+            ssm.StringParameter(
+                self, f"{identifier}-isolated-subnet-{i+1}-param",
+                parameter_name=f"/{vpc_name}/isolated-subnet-{i+1}/id",
+                string_value=subnet.subnet_id,
+                description=f"Isolated Subnet {i+1} ID for {vpc_name}"
+            )
+            # Store availability zone
+            ssm.StringParameter(
+                self, f"{identifier}-isolated-subnet-{i+1}-az-param",
+                parameter_name=f"/{vpc_name}/isolated-subnet-{i+1}/az",
+                string_value=subnet.availability_zone,
+                description=f"Isolated Subnet {i+1} AZ for {vpc_name}"
+            )
+        
         # Create SSM parameters for subnet access by name and AZ based on config
         subnet_type_mapping = {
             'public': self.vpc.public_subnets,
@@ -0,0 +1,116 @@
+import math
+import os
+import random
+
+import pytest
+
+from tools import alb_log_analyzer as analyzer
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures', 'alb_logs')
+PLAIN_LOG = os.path.join(FIXTURES, '2026', '10', '19', 'a.log')
+GZIP_LOG = os.path.join(FIXTURES, '2026', '10', '19', 'b.log.gz')
+
+
+def read_lines(path):
+    with analyzer.open_local(path) as log_file:
+        return log_file.readlines()
+
+
+def test_parse_line_valid_entry():
+    entry = analyzer.parse_line(read_lines(PLAIN_LOG)[1])
+
+    assert entry['target'] == '10.0.0.10:80'
+    assert entry['elb_status_code'] == '200'
+    assert entry['path'] == '/owa/'
+    assert entry['timings'] == {
+        'request_processing_time': 0.001,
+        'target_processing_time': 0.02,
+        'response_processing_time': 0.0
+    }
+
+
+def test_parse_line_undispatched_entry_keeps_negative_timings():
+    entry = analyzer.parse_line(read_lines(PLAIN_LOG)[3])
+
+    assert entry['target'] == '-'
+    assert entry['elb_status_code'] == '460'
+    assert set(entry['timings'].values()) == {-1.0}
+
+
+def test_parse_line_garbage_returns_none():
+    assert analyzer.parse_line(read_lines(PLAIN_LOG)[4]) is None
+    assert analyzer.parse_line('') is None
+
+
+def test_histogram_percentiles_within_relative_error():
+    rng = random.Random(7)
+    values = [rng.lognormvariate(-3, 1) for _ in range(20000)]
+    histogram = analyzer.LatencyHistogram()
+    for value in values:
+        histogram.add(value)
+
+    values.sort()
+    for percent in analyzer.PERCENTILES:
+        exact = values[int(math.ceil(percent / 100.0 * len(values))) - 1]
+        assert abs(histogram.percentile(percent) - exact) / exact <= 0.01
+
+
+def test_histogram_empty_returns_none():
+    assert analyzer.LatencyHistogram().percentile(50) is None
+
+
+def test_iter_local_files_finds_plain_and_gzip_logs():
+    files = list(analyzer.iter_local_files(FIXTURES))
+
+    assert files == [PLAIN_LOG, GZIP_LOG]
+
+
+def test_iter_local_files_missing_path_exits():
+    missing = os.path.join(FIXTURES, 'nonexistent')
+
+    with pytest.raises(SystemExit, match='No such file or directory'):
+        list(analyzer.iter_local_files(missing))
+
+
+def test_iter_lines_warns_when_no_logs_found(tmp_path, capsys):
+    (tmp_path / 'notes.txt').write_text('not a log file\n')
+
+    assert list(analyzer.iter_lines([str(tmp_path)])) == []
+    assert 'No .log or .gz files found' in capsys.readouterr().err
+
+
+def test_analyze_groups_by_target_path_and_status():
+    report, skipped = analyzer.analyze(analyzer.iter_lines([FIXTURES]))
+
+    assert skipped == 1
+    assert {key: group['count'] for key, group in report['target'].items()} == {
+        '10.0.0.10:80': 3, '10.0.0.11:80': 2, '-': 1
+    }
+    assert {key: group['count'] for key, group in report['path'].items()} == {
+        '/': 2, '/owa/': 2, '/api/items': 1, '/missing': 1
+    }
+    assert {key: group['count'] for key, group in report['status'].items()} == {
+        '200': 3, '460': 1, '502': 1, '404': 1
+    }
+
+    # Undispatched requests are counted but carry no timings
+    assert report['target']['-']['target_processing_time']['p50'] is None
+    assert report['target']['10.0.0.11:80']['target_processing_time']['p99'] == 0.2
+    assert report['status']['502']['target_processing_time']['p50'] == 0.2
+
+
+def test_analyze_ignores_repeated_dimensions():
+    report, _ = analyzer.analyze(analyzer.iter_lines([FIXTURES]), ['target', 'target'])
+
+    assert list(report) == ['target']
+    assert {key: group['count'] for key, group in report['target'].items()} == {
+        '10.0.0.10:80': 3, '10.0.0.11:80': 2, '-': 1
+    }
+
+
+def test_analyze_folds_groups_beyond_cap():
+    report, _ = analyzer.analyze(analyzer.iter_lines([FIXTURES]), ['path'], max_groups=2)
+
+    assert {key: group['count'] for key, group in report['path'].items()} == {
+        '/': 2, '/owa/': 2, analyzer.OTHER_GROUP: 2
+    }
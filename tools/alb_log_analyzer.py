@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+# alb_log_analyzer.py
+# Streaming analyzer for Application Load Balancer access logs
+# Reports p50/p95/p99 request, target and response processing times per target, path and status code
+#
+# Usage:
+#   python tools/alb_log_analyzer.py ./logs/                              # local .log/.gz files or directories
+#   python tools/alb_log_analyzer.py s3://bucket/prefix/AWSLogs/...       # S3 prefix (requires boto3)
+#   python tools/alb_log_analyzer.py ./logs/ --group-by target --top 10 --json
+#
+# Files are read line by line and latencies are folded into log-scale histograms,
+# so memory grows with the number of distinct groups, not with the number of requests.
+# Groups per dimension are capped (--max-groups); once the cap is reached, new keys
+# such as unseen paths are folded into a single '(other)' group, keeping memory bounded.
+
+import argparse
+import contextlib
+import gzip
+import io
+import json
+import math
+import os
+import re
+import sys
+from urllib.parse import urlsplit
+
+# Leading fields of an ALB access log entry, up to and including the quoted request line
+LOG_PATTERN = re.compile(
+    r'^(?P<type>\S+) (?P<time>\S+) (?P<elb>\S+) (?P<client>\S+) (?P<target>\S+) '
+    r'(?P<request_processing_time>\S+) (?P<target_processing_time>\S+) (?P<response_processing_time>\S+) '
+    r'(?P<elb_status_code>\S+) (?P<target_status_code>\S+) (?P<received_bytes>\S+) (?P<sent_bytes>\S+) '
+    r'"(?P<request>[^"]*)"'
+)
+
+TIMING_FIELDS = ['request_processing_time', 'target_processing_time', 'response_processing_time']
+GROUP_BY_CHOICES = ['target', 'path', 'status']
+PERCENTILES = [50, 95, 99]
+DEFAULT_MAX_GROUPS = 1000
+OTHER_GROUP = '(other)'
+
+
+class LatencyHistogram:
+    """Log-scale histogram giving percentile estimates within a fixed relative error"""
+
+    MIN_VALUE = 0.0001          # Values below 0.1 ms share the lowest bucket
+
+    def __init__(self, relative_error=0.01):
+        self.gamma = (1 + relative_error) / (1 - relative_error)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.count = 0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        """Record a single latency value in seconds"""
+        index = 0 if value <= self.MIN_VALUE else \
+            int(math.ceil(math.log(value / self.MIN_VALUE) / self.log_gamma))
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, percent):
+        """Estimate the value at the given percentile (0-100), None if empty"""
+        if not self.count:
+            return None
+        rank = max(1, int(math.ceil(percent / 100.0 * self.count)))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                if index == 0:
+                    estimate = self.MIN_VALUE
+                else:
+                    # Midpoint of the bucket bounds keeps the estimate within the relative error
+                    estimate = self.MIN_VALUE * 2 * self.gamma ** index / (self.gamma + 1)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+
+class GroupStats:
+    """Request count and processing-time histograms for one group"""
+
+    def __init__(self):
+        self.count = 0
+        self.histograms = {field: LatencyHistogram() for field in TIMING_FIELDS}
+
+    def add(self, timings):
+        self.count += 1
+        for field, value in timings.items():
+            # ALB logs -1 when the request was never dispatched or the connection dropped
+            if value >= 0:
+                self.histograms[field].add(value)
+
+    def summary(self):
+        return {
+            'count': self.count,
+            **{
+                field: {f'p{p}': self.histograms[field].percentile(p) for p in PERCENTILES}
+                for field in TIMING_FIELDS
+            }
+        }
+
+
+def parse_line(line):
+    """Parse one access log line into a dict, None if the line is not an ALB entry"""
+    match = LOG_PATTERN.match(line)
+    if not match:
+        return None
+    entry = match.groupdict()
+
+    # Request line is "METHOD URL PROTOCOL"; keep only the URL path for grouping
+    request_parts = entry['request'].split(' ')
+    url = request_parts[1] if len(request_parts) > 1 else ''
+    entry['path'] = urlsplit(url).path or '-'
+
+    try:
+        entry['timings'] = {field: float(entry[field]) for field in TIMING_FIELDS}
+    except ValueError:
+        return None
+    return entry
+
+
+def open_local(path):
+    """Open a local log file as a text stream, decompressing .gz files"""
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8', errors='replace')
+    return open(path, 'r', encoding='utf-8', errors='replace')
+
+
+def iter_local_files(path):
+    """Yield log file paths under a file or directory in sorted order"""
+    if os.path.isfile(path):
+        yield path
+        return
+    if not os.path.isdir(path):
+        raise SystemExit(f"No such file or directory: {path}")
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            if name.endswith('.log') or name.endswith('.gz'):
+                yield os.path.join(root, name)
+
+
+def iter_s3_lines(uri):
+    """Stream log lines from every object under an s3://bucket/prefix URI"""
+    try:
+        import boto3
+    except ImportError:
+        raise SystemExit("boto3 is required to read access logs from S3 (pip install boto3)")
+
+    parsed = urlsplit(uri)
+    bucket, prefix = parsed.netloc, parsed.path.lstrip('/')
+    s3 = boto3.client('s3')
+    paginator = s3.get_paginator('list_objects_v2')
+    for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+        for obj in page.get('Contents', []):
+            body = s3.get_object(Bucket=bucket, Key=obj['Key'])['Body']
+            # Close the HTTP response even if the caller stops reading mid-object
+            with contextlib.closing(body):
+                stream = gzip.GzipFile(fileobj=body) if obj['Key'].endswith('.gz') else body
+                for line in io.TextIOWrapper(stream, encoding='utf-8', errors='replace'):
+                    yield line
+
+
+def iter_lines(sources):
+    """Yield log lines from local paths and S3 URIs, one file at a time"""
+    for source in sources:
+        if source.startswith('s3://'):
+            yield from iter_s3_lines(source)
+            continue
+        found = False
+        for path in iter_local_files(source):
+            found = True
+            with open_local(path) as log_file:
+                yield from log_file
+        if not found:
+            print(f"No .log or .gz files found under {source}", file=sys.stderr)
+
+
+def analyze(lines, group_by=GROUP_BY_CHOICES, max_groups=DEFAULT_MAX_GROUPS):
+    """Aggregate processing-time percentiles per group for each requested dimension"""
+    # Repeated dimensions would count every entry more than once
+    group_by = list(dict.fromkeys(group_by))
+    results = {dimension: {} for dimension in group_by}
+    skipped = 0
+    for line in lines:
+        entry = parse_line(line)
+        if entry is None:
+            skipped += 1
+            continue
+        keys = {
+            'target': entry['target'],
+            'path': entry['path'],
+            'status': entry['elb_status_code']
+        }
+        for dimension in group_by:
+            groups = results[dimension]
+            key = keys[dimension]
+            # Fold keys beyond the cap into one group so memory stays bounded
+            if key not in groups and max_groups and len(groups) >= max_groups:
+                key = OTHER_GROUP
+            if key not in groups:
+                groups[key] = GroupStats()
+            groups[key].add(entry['timings'])
+
+    return {
+        dimension: {key: stats.summary() for key, stats in groups.items()}
+        for dimension, groups in results.items()
+    }, skipped
+
+
+def format_table(report, top=None):
+    """Render the report as plain-text tables, busiest groups first"""
+    lines = []
+    for dimension, groups in report.items():
+        header = f"{dimension:<40} {'count':>8}"
+        for field in TIMING_FIELDS:
+            short = field.split('_')[0]
+            header += ''.join(f" {short + '_p' + str(p):>14}" for p in PERCENTILES)
+        lines.append(header)
+        lines.append('-' * len(header))
+
+        ordered = sorted(groups.items(), key=lambda item: item[1]['count'], reverse=True)
+        for key, summary in ordered[:top]:
+            row = f"{key[:40]:<40} {summary['count']:>8}"
+            for field in TIMING_FIELDS:
+                for p in PERCENTILES:
+                    value = summary[field][f'p{p}']
+                    row += f" {'-' if value is None else format(value, '.4f'):>14}"
+            lines.append(row)
+        lines.append('')
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Latency percentiles from ALB access logs")
+    parser.add_argument('sources', nargs='+', help="Log files, directories or s3://bucket/prefix URIs")
+    parser.add_argument('--group-by', choices=GROUP_BY_CHOICES, action='append',
+                        help="Dimension to report (repeatable, default: all)")
+    parser.add_argument('--top', type=int, default=None, help="Show only the N busiest groups per dimension")
+    parser.add_argument('--max-groups', type=int, default=DEFAULT_MAX_GROUPS,
+                        help=f"Track at most N groups per dimension; later keys are reported as '{OTHER_GROUP}'. "
+                             f"Memory is bounded by this cap, not by log volume (default: {DEFAULT_MAX_GROUPS}, 0 for no cap)")
+    parser.add_argument('--json', action='store_true', help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report, skipped = analyze(iter_lines(args.sources), args.group_by or GROUP_BY_CHOICES, args.max_groups)
+    if args.json:
+        print(json.dumps(report, indent=2, sort_keys=True))
+    else:
+        print(format_table(report, args.top))
+    if skipped:
+        print(f"Skipped {skipped} unparseable lines", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())